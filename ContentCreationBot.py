@@ -19,16 +19,15 @@
  
     ```
     PyMuPDF
-    numpy==1.23.5
     pandas
     gTTS
-    openai-whisper
-    pydub
-    scikit-video
-    SoundFile
+    faster-whisper>=1.1
     gradio
     ```
  
+    Optionally install `piper-tts>=1.3` and download a Piper voice model (e.g. `en_US-amy-medium.onnx`)
+    to generate the narration locally instead of through Google's TTS service.
+ 
  4. Open a terminal in the directory containing these files and run:
  
     ```
@@ -68,21 +67,41 @@ warnings.filterwarnings("ignore")
 import fitz
 import numpy as np
 import pandas as pd
+import io
+import json
 import os
 import re
 from gtts import gTTS
-import whisper
+import ctranslate2
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
 import tempfile
-from pydub import AudioSegment
-import skvideo.io
-import soundfile as sf
 from subprocess import check_output, STDOUT, CalledProcessError
 import gradio as gr
 import shutil
+import threading
 import traceback
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from piper import PiperVoice
+except ImportError:  # piper-tts (>=1.3) is optional, gTTS is used without it
+    PiperVoice = None
 
 # ## PDF Text Extraction
 
+# Patterns used by clean_text, compiled once at import. _RE_DROP matches, in one pass, escaped
+# single quotes (group 1, replaced by a plain quote) and authors' names and dataset names (removed);
+# the two cannot overlap, so fusing them gives the same result as running them in turn. Section
+# headings are removed in a separate pass afterwards, because removing a name can expose one.
+_RE_DROP = re.compile(
+    r"(\\')"
+    r'|\b[A-Z]+\s[A-Z]\s[A-Z]+(?:\s-\s[A-Z]\s-\s\d+)\b'
+)
+_RE_SECTION = re.compile(r'\b\d+\.\s[A-Z]+\b')
+_RE_WS = re.compile(r'\s+')
+
+
 def pdf_extract(pdf_path):
     """
     Extracts all text from a PDF file.
@@ -96,11 +115,8 @@ def pdf_extract(pdf_path):
     Returns:
     str: The extracted text from the PDF, with each page separated by a newline.
     """
-    text = ""
     doc = fitz.open(pdf_path)
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
-        text += page.get_text() + "\n"
+    text = "\n".join(page.get_text() for page in doc)
     doc.close()
     return text.strip()
 
@@ -119,17 +135,14 @@ def clean_text(text):
     Returns:
     str: The cleaned text, ready for further processing or narration.
     """
-    # Replace escaped single quotes
-    text = re.sub(r"(?i)\\\'", "'", text)
-    
-    # Remove authors' names and specific dataset names
-    text = re.sub(r'\b[A-Z]+\s[A-Z]\s[A-Z]+(\s-\s[A-Z]\s-\s\d+)\b', '', text)
+    # Replace escaped single quotes, remove authors' names and specific dataset names
+    text = _RE_DROP.sub(lambda match: "'" if match.group(1) else '', text)
     
     # Remove section headings
-    text = re.sub(r'\b\d+\.\s[A-Z]+\b', '', text)
+    text = _RE_SECTION.sub('', text)
     
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _RE_WS.sub(' ', text)
     
     return text
 
@@ -154,70 +167,246 @@ def content_extract(file_name):
 
 # ## Audio Generation and Transcription
 
-def generate_audio(text, language='en', filename='output.mp3'):
+# gTTS narration is split at sentence ends into chunks of about TTS_CHUNK_CHARS characters,
+# which are requested from Google's service TTS_WORKERS at a time
+_RE_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+TTS_CHUNK_CHARS = 500
+TTS_WORKERS = 4
+
+# Piper voice model used for offline narration; gTTS is used when piper-tts or the model is missing
+PIPER_VOICE_PATH = os.environ.get('PIPER_VOICE_PATH', 'en_US-amy-medium.onnx')
+_PIPER_VOICE = None
+_PIPER_VOICE_LOCK = threading.Lock()
+
+# Whisper runs on the GPU when CUDA is available, in the first of these compute types the GPU
+# supports; otherwise on the CPU with int8 weights (CTranslate2 quantizes the linear layers at load time)
+WHISPER_CUDA_COMPUTE_TYPES = ('float16', 'int8_float16', 'float32')
+
+
+def _select_whisper_device():
     """
-    Generate audio from text using gTTS and save it to a file.
+    Choose the device and compute type for Whisper inference on this host.
     
-    This function converts the given text into speech using Google's Text-to-Speech (gTTS) service.
-    It's used to create the narration audio for the video.
+    Returns:
+    tuple: The device ('cuda' or 'cpu') and the CTranslate2 compute type to use on it.
+    """
+    if ctranslate2.get_cuda_device_count() > 0:
+        supported = ctranslate2.get_supported_compute_types('cuda')
+        for compute_type in WHISPER_CUDA_COMPUTE_TYPES:
+            if compute_type in supported:
+                return 'cuda', compute_type
+    return 'cpu', 'int8'
+
+
+WHISPER_DEVICE, WHISPER_COMPUTE_TYPE = _select_whisper_device()
+
+# Number of 30-second windows decoded together; clips shorter than WHISPER_BATCH_MIN_SECONDS
+# fit in a single window, so they go through the pipeline with a batch size of 1
+WHISPER_BATCH_SIZE = 8
+WHISPER_BATCH_MIN_SECONDS = 10
+WHISPER_SAMPLE_RATE = 16000
+
+# Whisper models loaded so far, keyed by model name, so repeated requests reuse them
+_MODEL_CACHE = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def _load_whisper_model(name):
+    """
+    Load a Whisper model on the selected device, falling back to the CPU if the GPU is unusable.
+    
+    CTranslate2 only loads cuBLAS and cuDNN on the first encode, so a GPU model is checked by
+    transcribing a second of silence before it is used.
+    
+    Args:
+    name (str): The Whisper model to load (e.g. 'small').
+    
+    Returns:
+    WhisperModel: The loaded model.
+    """
+    if WHISPER_DEVICE != 'cpu':
+        try:
+            model = WhisperModel(name, device=WHISPER_DEVICE, compute_type=WHISPER_COMPUTE_TYPE)
+            segments, info = model.transcribe(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32), language='en')
+            list(segments)
+            return model
+        except (ValueError, RuntimeError) as e:
+            print(f"Failed to run Whisper on {WHISPER_DEVICE}, falling back to the CPU. Reason: {e}")
+    return WhisperModel(name, device='cpu', compute_type='int8')
+
+
+def _get_model(name):
+    """
+    Return the Whisper model with the given name, loading it on first use.
+    
+    Args:
+    name (str): The Whisper model to load (e.g. 'small').
+    
+    Returns:
+    WhisperModel: The cached model instance.
+    """
+    # Held while loading, so a load still running from an earlier request is waited for, not repeated
+    with _MODEL_CACHE_LOCK:
+        if name not in _MODEL_CACHE:
+            _MODEL_CACHE[name] = _load_whisper_model(name)
+        return _MODEL_CACHE[name]
+
+
+def _get_piper_voice():
+    """
+    Return the Piper voice for offline narration, loading it on first use.
+    
+    Returns:
+    PiperVoice or None: The loaded voice, or None if piper-tts or the voice model is not available
+    or the model could not be loaded.
+    """
+    global _PIPER_VOICE
+    with _PIPER_VOICE_LOCK:
+        if _PIPER_VOICE is None and PiperVoice is not None and os.path.exists(PIPER_VOICE_PATH):
+            try:
+                _PIPER_VOICE = PiperVoice.load(PIPER_VOICE_PATH)
+            except Exception as e:
+                print(f"Failed to load Piper voice {PIPER_VOICE_PATH}, falling back to gTTS. Reason: {e}")
+        return _PIPER_VOICE
+
+
+def _split_narration(text, max_chars=TTS_CHUNK_CHARS):
+    """
+    Split narration text into chunks of whole sentences for parallel TTS requests.
+    
+    Args:
+    text (str): The text to split.
+    max_chars (int): The target maximum length of a chunk; a single longer sentence is kept whole.
+    
+    Returns:
+    list: The chunks, in reading order.
+    """
+    chunks = []
+    current = ''
+    for sentence in _RE_SENTENCE_END.split(text.strip()):
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f'{current} {sentence}' if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _gtts_bytes(text, language):
+    """
+    Synthesize text with gTTS and return the MP3 data.
     
     Args:
     text (str): The text to convert to speech.
-    language (str): The language of the text (default: 'en' for English).
-    filename (str): The name of the output audio file (default: 'output.mp3').
+    language (str): The language of the text.
+    
+    Returns:
+    bytes: The MP3 audio.
     """
-    tts = gTTS(text=text, lang=language)
-    tts.save(filename)
-    print(f"Audio saved as {filename}")
+    return b"".join(gTTS(text=text, lang=language).stream())
 
 
-def convert_to_wav(mp3_filename):
+def synthesize_audio(text, language='en'):
     """
-    Convert an MP3 file to WAV format for processing.
+    Generate speech audio from text in memory.
     
-    This function is used because some audio processing libraries work better with WAV files.
-    It converts the generated MP3 narration to WAV format for further processing.
+    This function converts the given text into speech. When a Piper voice model for `language` is
+    available the speech is synthesized locally as WAV; otherwise, or if Piper fails, Google's Text-to-Speech (gTTS) service is used,
+    with the text split into sentence chunks that are requested in parallel and concatenated
+    (MP3 frames can be joined as-is).
     
     Args:
-    mp3_filename (str): The name of the MP3 file.
+    text (str): The text to convert to speech.
+    language (str): The language of the text (default: 'en' for English); selects gTTS's voice and
+        whether the Piper voice can be used.
     
     Returns:
-    str: The name of the converted WAV file.
+    tuple: The encoded audio (bytes) and its file extension ('.wav' or '.mp3').
     """
-    wav_filename = os.path.splitext(mp3_filename)[0] + '.wav'
-    sound = AudioSegment.from_mp3(mp3_filename)
-    sound.export(wav_filename, format="wav")
-    return wav_filename
+    # Piper voices speak a single language (espeak_voice is e.g. 'en-us'), so only use one that
+    # matches the text's language
+    voice = _get_piper_voice()
+    if voice is not None and voice.config.espeak_voice.split('-')[0].lower() == language.split('-')[0].lower():
+        try:
+            buffer = io.BytesIO()
+            with wave.open(buffer, 'wb') as wav_file:
+                voice.synthesize_wav(text, wav_file)
+            return buffer.getvalue(), '.wav'
+        except Exception as e:
+            print(f"Piper synthesis failed, falling back to gTTS. Reason: {e}")
+    
+    chunks = _split_narration(text) or [text]
+    with ThreadPoolExecutor(max_workers=TTS_WORKERS) as executor:
+        mp3_parts = list(executor.map(_gtts_bytes, chunks, [language] * len(chunks)))
+    return b"".join(mp3_parts), '.mp3'
 
 
-def transcribe_audio(audio_filename, model='small', output_dir='.', language='en'):
+def generate_audio(text, language='en', filename='output.mp3'):
+    """
+    Generate audio from text and save it to a file.
+    
+    This function converts the given text into speech with `synthesize_audio` and writes it to
+    `filename`, replacing the extension with the one matching the engine that was used.
+    It's used to create the narration audio for the video.
+    
+    Args:
+    text (str): The text to convert to speech.
+    language (str): The language of the text (default: 'en' for English).
+    filename (str): The name of the output audio file (default: 'output.mp3').
+    
+    Returns:
+    tuple: The name of the audio file that was written and its contents (bytes), so later steps
+    can use the audio without reading the file back.
+    """
+    audio_data, extension = synthesize_audio(text, language)
+    filename = os.path.splitext(filename)[0] + extension
+    with open(filename, 'wb') as audio_file:
+        audio_file.write(audio_data)
+    print(f"Audio saved as {filename}")
+    return filename, audio_data
+
+
+def transcribe_audio(audio_filename, model_name='small', output_dir='.', language='en', audio_data=None):
     """
     Transcribe audio file and generate subtitles.
     
-    This function uses the Whisper model to transcribe the narration audio and generate subtitles.
+    This function uses the faster-whisper (CTranslate2) implementation of the Whisper model, in
+    reduced precision on a CUDA GPU or with int8 weights on the CPU, to transcribe the narration
+    audio and generate subtitles. Longer narrations are split into 30-second windows that are run
+    through the model in batches.
     It's a key step in creating synchronized subtitles for the video.
     
     Args:
     audio_filename (str): The name of the audio file.
-    model (str): The Whisper model to use (default: 'small').
+    model_name (str): The Whisper model to use (default: 'small').
     output_dir (str): The directory to save the output (default: '.').
     language (str): The language of the audio (default: 'en' for English).
+    audio_data (bytes): The contents of the audio file, if already in memory; decoded instead of
+        reading the file again (default: None).
     
     Returns:
     str: The path of the generated SRT subtitle file.
     """
     os.makedirs(output_dir, exist_ok=True)
-    audio_filename_wav = convert_to_wav(audio_filename)
+    # Decode the audio straight to 16 kHz mono samples, no intermediate WAV file needed
+    audio_source = io.BytesIO(audio_data) if audio_data is not None else audio_filename
+    audio = decode_audio(audio_source, sampling_rate=WHISPER_SAMPLE_RATE)
+    audio_duration = len(audio) / WHISPER_SAMPLE_RATE
+    batch_size = WHISPER_BATCH_SIZE if audio_duration >= WHISPER_BATCH_MIN_SECONDS else 1
     
-    model = whisper.load_model(model)
+    pipeline = BatchedInferencePipeline(model=_get_model(model_name))
     print(f"Transcribing {audio_filename}...")
-    result = model.transcribe(audio_filename_wav, task='transcribe', language=language)
+    # The batched pipeline defaults to one segment per VAD chunk (up to 30 s); keep the timestamp
+    # tokens so subtitles are split into short cues
+    segments, info = pipeline.transcribe(audio, batch_size=batch_size, language=language, vad_filter=True,
+                                         without_timestamps=False)
     
     srt_path = os.path.join(output_dir, os.path.splitext(os.path.basename(audio_filename))[0] + '.srt')
     with open(srt_path, "w", encoding="utf-8") as srt_file:
-        write_srt(iter(result['segments']), srt_file)
+        write_srt(segments, srt_file)
     
-    os.remove(audio_filename_wav)  # Clean up the WAV file
     return srt_path
 
 
@@ -229,14 +418,16 @@ def write_srt(transcript, file):
     SRT is a widely supported format for video subtitles.
     
     Args:
-    transcript (iterator): An iterator of transcript segments from the Whisper model.
+    transcript (iterable): The transcript segments produced by the Whisper model.
     file (file object): The file to write the SRT content to.
     """
+    chunks = []
     for i, segment in enumerate(transcript, start=1):
-        start_time = format_timestamp(segment['start'])
-        end_time = format_timestamp(segment['end'])
-        text = segment['text'].replace('-->', '->').strip()
-        file.write(f"{i}\n{start_time} --> {end_time}\n{text}\n\n")
+        start_time = format_timestamp(segment.start)
+        end_time = format_timestamp(segment.end)
+        text = segment.text.replace('-->', '->').strip()
+        chunks.append(f"{i}\n{start_time} --> {end_time}\n{text}\n\n")
+    file.write("".join(chunks))
 
 
 def format_timestamp(seconds):
@@ -251,68 +442,139 @@ def format_timestamp(seconds):
     Returns:
     str: The formatted timestamp in SRT format (HH:MM:SS,mmm).
     """
-    hours, remainder = divmod(int(seconds), 3600)
-    minutes, seconds = divmod(remainder, 60)
-    milliseconds = int((seconds - int(seconds)) * 1000)
-    return f"{hours:02}:{minutes:02}:{int(seconds):02},{milliseconds:03}"
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds:03}"
 
 
 # ## Video Processing
 
-def overlay_audio_and_subtitles_on_video(video_path, audio_path, subtitle_path, output_path):
+# Whether FFmpeg can encode with NVENC on this host, checked on first use
+_NVENC_AVAILABLE = None
+
+
+def _nvenc_available():
     """
-    Overlay audio and subtitles on a video.
+    Check whether the NVIDIA hardware H.264 encoder can be used for the final encode.
     
-    This function combines the original video with the generated narration audio and subtitles.
-    It uses FFmpeg to process the video, which allows for complex video manipulations.
+    Returns:
+    bool: True if FFmpeg was built with h264_nvenc and a CUDA device is present.
+    """
+    global _NVENC_AVAILABLE
+    if _NVENC_AVAILABLE is None:
+        try:
+            encoders = check_output(['ffmpeg', '-hide_banner', '-encoders'], stderr=STDOUT).decode()
+        except (CalledProcessError, OSError):
+            encoders = ''
+        _NVENC_AVAILABLE = 'h264_nvenc' in encoders and ctranslate2.get_cuda_device_count() > 0
+    return _NVENC_AVAILABLE
+
+
+def get_video_duration(video_path):
+    """
+    Get the duration of a video file.
+    
+    Args:
+    video_path (str): Path to the video file.
+    
+    Returns:
+    float: The duration of the video stream in seconds.
+    """
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=duration',
+        '-of', 'json',
+        video_path
+    ]
+    video_info = json.loads(check_output(cmd))
+    return float(video_info['streams'][0]['duration'])
+
+
+def _overlay_command(video_path, audio_path, subtitle_path, output_path, video_duration, use_nvenc):
+    """
+    Build the FFmpeg command that burns in the subtitles and muxes the looped narration.
     
     Args:
     video_path (str): Path to the input video file.
     audio_path (str): Path to the audio file (narration).
     subtitle_path (str): Path to the subtitle file (SRT format).
     output_path (str): Path for the output video file.
-    """
-    # Get video info
-    video_info = skvideo.io.ffprobe(video_path)
-    video_duration = float(video_info['video']['@duration'])
-    
-    # Read and adjust audio
-    audio, sample_rate = sf.read(audio_path)
-    audio_duration = len(audio) / sample_rate
-    if audio_duration > video_duration:
-        audio = audio[:int(video_duration * sample_rate)]
-    elif audio_duration < video_duration:
-        repeat_times = int(np.ceil(video_duration / audio_duration))
-        audio = np.tile(audio, repeat_times)[:int(video_duration * sample_rate)]
+    video_duration (float): Duration of the input video in seconds.
+    use_nvenc (bool): Whether to decode and encode on the GPU with NVENC instead of libx264.
     
-    # Save adjusted audio
-    temp_audio_path = 'temp_audio.wav'
-    sf.write(temp_audio_path, audio, sample_rate)
-    
-    # Construct FFmpeg command
-    cmd = [
+    Returns:
+    list: The FFmpeg command line.
+    """
+    # Decoded frames are copied back to system memory because the subtitles filter runs on the CPU.
+    # -b:v 0 lifts NVENC's default average bitrate so -cq sets the quality, like -crf for x264.
+    if use_nvenc:
+        decode_args = ['-hwaccel', 'cuda']
+        encode_args = ['-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-b:v', '0']
+    else:
+        decode_args = []
+        encode_args = ['-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '23', '-threads', '0']
+    
+    # The narration is looped by FFmpeg and the output is cut at the video's duration, so the audio
+    # never has to be decoded or tiled in Python. -y lets a fallback encode replace a partial output.
+    return [
         'ffmpeg',
+        '-y',
+        *decode_args,
         '-i', video_path,
-        '-i', temp_audio_path,
+        '-stream_loop', '-1',
+        '-i', audio_path,
         '-vf', f"subtitles={subtitle_path}:force_style='FontName=Arial,Bold=10,FontSize=12,Alignment=6,MarginV=20'",
-        '-c:v', 'libx264',
-        '-c:a', 'aac',
+        *encode_args,
+        # MP3 narration is muxed into the MP4 as-is; MP4 cannot carry PCM, so WAV is encoded
+        '-c:a', 'copy' if audio_path.lower().endswith('.mp3') else 'aac',
         '-map', '0:v:0',
         '-map', '1:a:0',
-        '-shortest',
+        '-t', f'{video_duration}',
         output_path
     ]
+
+
+def overlay_audio_and_subtitles_on_video(video_path, audio_path, subtitle_path, output_path, video_duration=None):
+    """
+    Overlay audio and subtitles on a video.
+    
+    This function combines the original video with the generated narration audio and subtitles.
+    It uses FFmpeg to process the video, which allows for complex video manipulations, and encodes
+    with NVENC instead of libx264 on hosts with an NVIDIA GPU, retrying with libx264 if NVENC fails.
+    
+    Args:
+    video_path (str): Path to the input video file.
+    audio_path (str): Path to the audio file (narration).
+    subtitle_path (str): Path to the subtitle file (SRT format).
+    output_path (str): Path for the output video file.
+    video_duration (float): Duration of the input video in seconds, probed if not given.
+    """
+    if video_duration is None:
+        video_duration = get_video_duration(video_path)
     
-    # Execute FFmpeg command
+    # Decode and encode on the GPU when NVENC is available; if the encoder cannot be opened on this
+    # host after all, fall back to libx264 for this and later videos
+    global _NVENC_AVAILABLE
+    use_nvenc = _nvenc_available()
     try:
-        check_output(cmd, stderr=STDOUT)
+        try:
+            check_output(_overlay_command(video_path, audio_path, subtitle_path, output_path,
+                                          video_duration, use_nvenc), stderr=STDOUT)
+        except CalledProcessError as e:
+            if not use_nvenc:
+                raise
+            print(f"NVENC encode failed, retrying with libx264. Reason: {e.output.decode()}")
+            _NVENC_AVAILABLE = False
+            check_output(_overlay_command(video_path, audio_path, subtitle_path, output_path,
+                                          video_duration, False), stderr=STDOUT)
         print(f"Video with overlaid audio and synchronized subtitles saved to {output_path}")
     except CalledProcessError as e:
         print(f"Error occurred: {e.output.decode()}")
     
-    # Clean up temporary files
-    os.remove(temp_audio_path)
-    
     return output_path
 
 
@@ -324,6 +586,8 @@ def process_pdf_and_video(pdf_file, video_file, output_filename):
     Process a PDF file and a video file to create a narrated video.
     
     This function orchestrates the entire process of converting a PDF to a narrated video.
+    PDF extraction, probing the video and loading the TTS voice and Whisper model are independent,
+    so they run concurrently before the narration is generated.
     It uses a 'data' folder for temporary files and cleans up afterwards.
     
     Args:
@@ -342,37 +606,44 @@ def process_pdf_and_video(pdf_file, video_file, output_filename):
     # Create data folder if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
-    # Extract content from PDF
-    content = content_extract(pdf_file)
-    print("\nContent extracted from pdf file!!\n")
-    
-    # Generate audio from content
-    audio_file = os.path.join('data', 'narration.mp3')
-    generate_audio(content, filename=audio_file)
-    print("\nAudio file generated!!!\n")
-    
-    # Transcribe audio to create subtitles
-    subtitle_file = transcribe_audio(audio_file, output_dir='data')
-    print("\nAudio transcription completed!!!\n")
-    
-    # Overlay audio and subtitles on video
-    output_file = os.path.join('data', f'{output_filename}.mp4')
-    overlay_audio_and_subtitles_on_video(video_file, audio_file, subtitle_file, output_file)
-    print("\nVideo Output complete!!\n")
+    executor = ThreadPoolExecutor()
+    try:
+        # Start the independent stages together
+        content_future = executor.submit(content_extract, pdf_file)
+        duration_future = executor.submit(get_video_duration, video_file)
+        voice_future = executor.submit(_get_piper_voice)
+        model_future = executor.submit(_get_model, 'small')
+        
+        # Extract content from PDF
+        content = content_future.result()
+        print("\nContent extracted from pdf file!!\n")
+        
+        # Generate audio from content; only FFmpeg needs it on disk, transcription uses the bytes
+        voice_future.result()
+        audio_file, audio_data = generate_audio(content, filename=os.path.join('data', 'narration.mp3'))
+        print("\nAudio file generated!!!\n")
+        
+        # Transcribe audio to create subtitles
+        model_future.result()
+        subtitle_file = transcribe_audio(audio_file, model_name='small', output_dir='data', audio_data=audio_data)
+        print("\nAudio transcription completed!!!\n")
+        
+        # Overlay audio and subtitles on video
+        output_file = os.path.join('data', f'{output_filename}.mp4')
+        overlay_audio_and_subtitles_on_video(video_file, audio_file, subtitle_file, output_file,
+                                             video_duration=duration_future.result())
+        print("\nVideo Output complete!!\n")
+    finally:
+        # Don't wait for loaders still running if an earlier stage failed; they finish in the
+        # background and leave their result in the cache for the next request
+        executor.shutdown(wait=False, cancel_futures=True)
     
     # Move final output to current directory
     shutil.move(output_file, f'{output_filename}.mp4')
     
     # Clean up data folder
-    for filename in os.listdir('data'):
-        file_path = os.path.join('data', filename)
-        try:
-            if os.path.isfile(file_path) or os.path.islink(file_path):
-                os.unlink(file_path)
-            elif os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-        except Exception as e:
-            print(f'Failed to delete {file_path}. Reason: {e}')
+    shutil.rmtree('data', ignore_errors=True)
+    os.makedirs('data', exist_ok=True)
     
     return f'{output_filename}.mp4'
 